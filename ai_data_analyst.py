@@ -1,16 +1,50 @@
 
+import asyncio
+import hashlib
 import os
+import re
+import time
 from pathlib import Path
 import pandas as pd
 import duckdb
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import streamlit as st
 from dotenv import load_dotenv
-from groq import Groq
+from groq import APITimeoutError, AsyncGroq, Groq, RateLimitError
 import io
 
-# load .env in project root (do not override already-set environment variables)
+# On-disk Parquet copies of parsed uploads, evicted least-recently-used past the size cap
+PARQUET_CACHE_DIR = Path(__file__).resolve().parent / ".parquet_cache"
+PARQUET_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# String columns whose distinct/total ratio is below this are stored as categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# DuckDB tuning; the memory limit (DUCKDB_MEMORY_LIMIT in the environment or .env)
+# defaults to DuckDB's own 80% of RAM
+DUCKDB_THREADS = os.cpu_count() or 1
+
+# Parsed datasets kept in memory (shared across sessions) before the oldest is dropped
+SHARED_DATASETS_MAX = 4
+
 env_path = Path(__file__).resolve().parent / ".env"
-load_dotenv(dotenv_path=env_path, override=False)
+
+
+@st.cache_resource
+def _init_env():
+    """Load .env in project root once per process rather than on every rerun.
+
+    Already-set environment variables are not overridden. Returns the GROQ key
+    available at startup, used as the sidebar default.
+    """
+    load_dotenv(dotenv_path=env_path, override=False)
+    return os.getenv("GROQ_API_KEY") or ""
+
+
+_DEFAULT_GROQ = _init_env()
+
 
 def _get_env_key(name: str):
     """Return the value for `name` from session state (if present) or the environment.
@@ -29,12 +63,13 @@ def _get_env_key(name: str):
 # --- Left sidebar: allow manual entry of API keys ---
 with st.sidebar:
     st.header("API Keys")
-    groq_input = st.text_input("GROQ API Key", value=os.getenv("GROQ_API_KEY") or "", type="password")
+    groq_input = st.text_input("GROQ API Key", value=_DEFAULT_GROQ, type="password")
     save_env = st.checkbox("Save keys to local .env file (overwrites existing)")
-    if st.button("Apply keys"):
+    apply_keys = st.button("Apply keys")
+    if apply_keys:
         if groq_input:
+            # Session only: writing os.environ would leak the key to every other session
             st.session_state["GROQ_API_KEY"] = groq_input
-            os.environ["GROQ_API_KEY"] = groq_input
 
         if save_env:
             try:
@@ -65,58 +100,350 @@ if not GROQ_API_KEY:
     )
     st.stop()
 
-client = Groq(api_key=GROQ_API_KEY)
+# Per-request timeout (seconds) and attempts for Groq calls; a stalled request
+# is abandoned and retried with exponential backoff instead of hanging the run
+GROQ_TIMEOUT = 15.0
+GROQ_ATTEMPTS = 3
+
+client = Groq(api_key=GROQ_API_KEY, timeout=GROQ_TIMEOUT, max_retries=0)
+
+# Result rows sent to the browser; larger results are truncated on screen (download has all rows)
+MAX_DISPLAY = 1000
+
+# Bounds on the sample data embedded in the prompt (all column names/types are always sent)
+PROMPT_SAMPLE_COLS = 20
+PROMPT_SAMPLE_ROWS = 5
+
+# SQL inside a ```sql (or ```sqlite) fence; an unterminated fence runs to the end of the reply
+_SQL_RE = re.compile(r"```(?:sqlite|sql)\b\s*(.*?)(?:```|\Z)", re.DOTALL | re.IGNORECASE)
 
+# Models queried side by side when "Compare models" is checked
+COMPARE_MODELS = ("openai/gpt-oss-120b", "meta-llama/llama-4-scout-17b-16e-instruct")
 
+
+def _create_completion(**kwargs):
+    """Create a Groq chat completion, retrying timeouts and rate limits with backoff"""
+    for attempt in range(GROQ_ATTEMPTS):
+        try:
+            return client.chat.completions.create(timeout=GROQ_TIMEOUT, **kwargs)
+        except (APITimeoutError, RateLimitError):
+            if attempt == GROQ_ATTEMPTS - 1:
+                raise
+            time.sleep(2 ** attempt)
+
+
+def stream_groq(system, user_msg, model= "openai/gpt-oss-120b"):
+    """Yield the reply text from Groq chunk by chunk as it is generated"""
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user_msg},
+    ]
+    # Show a spinner until the first token arrives; after that the streamed text is the progress
+    with st.spinner("Generating SQL query..."):
+        chunks = iter(_create_completion(model=model, messages=messages, stream=True))
+        first = next(chunks, None)
+    if first is None:
+        return
+    yield first.choices[0].delta.content or ""
+    for chunk in chunks:
+        yield chunk.choices[0].delta.content or ""
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
 def call_groq_model(system, user_msg, model= "openai/gpt-oss-120b"):
-    """Call Groq API with specified model"""
+    """Stream the reply into the page and return its full text.
+
+    Memoized on (system, user_msg, model) for an hour; on a cache hit Streamlit
+    replays the rendered reply without calling Groq.
+    """
+    return st.write_stream(stream_groq(system, user_msg, model))
+
+
+async def _call_groq_many(system, user_msg, models):
+    """Send the same prompt to several models concurrently.
+
+    Returns one entry per model, in order: the reply text, or the exception
+    raised for that model so one failure doesn't discard the other answers.
+    """
     messages = [
         {"role": "system", "content": system},
         {"role": "user", "content": user_msg},
     ]
+    # The SDK's own backoff applies per request, so retries don't hold up the other models
+    async with AsyncGroq(api_key=GROQ_API_KEY, timeout=GROQ_TIMEOUT, max_retries=GROQ_ATTEMPTS - 1) as aclient:
+        resps = await asyncio.gather(
+            *[aclient.chat.completions.create(model=m, messages=messages) for m in models],
+            return_exceptions=True,
+        )
+    return [r if isinstance(r, Exception) else r.choices[0].message.content for r in resps]
+
+
+def call_groq_models(system, user_msg, models=COMPARE_MODELS):
+    """Blocking wrapper around `_call_groq_many` for use from the Streamlit script"""
+    return asyncio.run(_call_groq_many(system, user_msg, models))
+
+
+# New keys may change what the API returns; don't serve answers cached under the old ones
+if apply_keys:
+    call_groq_model.clear()
+
+
+def _parse_upload(name: str, data: bytes) -> pd.DataFrame:
+    """Parse uploaded CSV/Excel bytes into a DataFrame.
+
+    CSVs go through the multi-threaded pyarrow parser and Excel files through
+    calamine when available; both fall back to the default engine.
+    """
+    if name.endswith('.csv'):
+        try:
+            return pd.read_csv(io.BytesIO(data), engine="pyarrow", dtype_backend="pyarrow")
+        except Exception:
+            # pyarrow missing or file it can't handle (e.g. ragged rows)
+            return pd.read_csv(io.BytesIO(data))
     try:
-        resp = client.chat.completions.create(model=model, messages=messages)
-        return resp.choices[0].message.content
-    except Exception as e:
-        # Fallback to alternative model if primary fails
-        if "mixtral" in model.lower():
-            try:
-                resp = client.chat.completions.create(model="meta-llama/llama-4-scout-17b-16e-instruct", messages=messages)
-                return resp.choices[0].message.content
-            except:
-                pass
-        raise e
+        return pd.read_excel(io.BytesIO(data), engine="calamine")
+    except Exception:
+        # python-calamine not installed or unsupported workbook
+        return pd.read_excel(io.BytesIO(data))
+
+
+def _shrink_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store repetitive string columns as categoricals, in place, to cut memory.
+
+    Only all-string columns with few distinct values are converted; DuckDB reads
+    them (as Arrow dictionaries) as plain VARCHAR, so SQL behaves as before.
+    Numeric columns keep their widths: narrower ints overflow in DuckDB
+    arithmetic and float32 changes computed results.
+    """
+    for col in df.columns:
+        s = df[col]
+        # infer_dtype rather than the dtype: object columns mixing numbers and
+        # text would make mixed-type categories that Arrow can't store
+        if pd.api.types.infer_dtype(s, skipna=True) != "string":
+            continue
+        if len(df) and s.nunique(dropna=True) / len(df) < CATEGORY_MAX_UNIQUE_RATIO:
+            df[col] = s.astype("category")
+    return df
+
+
+def _evict_parquet_cache():
+    """Delete least recently used Parquet files until the cache fits in PARQUET_CACHE_MAX_BYTES"""
+    files = sorted(PARQUET_CACHE_DIR.glob("*.parquet"), key=lambda f: f.stat().st_mtime)
+    total = sum(f.stat().st_size for f in files)
+    for f in files:
+        if total <= PARQUET_CACHE_MAX_BYTES:
+            break
+        total -= f.stat().st_size
+        f.unlink(missing_ok=True)
+
+
+def _load_dataframe(data_fingerprint: str, name: str, data: bytes) -> tuple[pd.DataFrame, pa.Table | None]:
+    """Load uploaded file bytes into a DataFrame and its Arrow table.
+
+    Parsed files have repetitive strings categorized and are kept on disk as
+    Parquet keyed by `data_fingerprint` (the content hash), so re-uploads (even
+    after a restart) skip CSV/Excel parsing entirely. The table is None when
+    the frame has columns Arrow can't store.
+    """
+    path = PARQUET_CACHE_DIR / f"{data_fingerprint}.parquet"
+    if path.exists():
+        try:
+            table = pq.read_table(path)
+            path.touch()  # mark as recently used for eviction
+            return table.to_pandas(), table
+        except Exception:
+            path.unlink(missing_ok=True)  # truncated or unreadable; re-parse below
+
+    df = _shrink_dtypes(_parse_upload(name, data))
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except Exception:
+        # Columns Arrow can't store (e.g. mixed-type objects); nothing to cache
+        return df, None
+    # Return the Arrow round trip rather than `df` itself so the dtypes are
+    # exactly those a later cache hit produces (e.g. string[pyarrow] -> string)
+    df = table.to_pandas()
+    try:
+        PARQUET_CACHE_DIR.mkdir(exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        tmp.replace(path)
+        _evict_parquet_cache()
+    except Exception:
+        # Read-only disk or a type Parquet can't store
+        pass
+    return df, table
+
+
+@st.cache_resource(show_spinner=False, max_entries=SHARED_DATASETS_MAX)
+def _shared_dataset(data_fingerprint: str, name: str, _upload) -> tuple[pd.DataFrame, pa.Table | pd.DataFrame]:
+    """Return (DataFrame, what DuckDB should scan) for an upload, shared by every session.
+
+    Keyed on the content fingerprint and file name; `_upload` is only read on a
+    miss. Sessions keep just the fingerprint, so concurrent users of the same
+    file hold one copy in memory instead of one each.
+    """
+    df, table = _load_dataframe(data_fingerprint, name, _upload.getvalue())
+    # The Arrow table is scanned zero-copy; frames Arrow can't hold (e.g. an Excel
+    # column mixing numbers and text) are registered as pandas, which DuckDB reads as VARCHAR
+    return df, (table if table is not None else df)
+
+
+@st.cache_resource
+def get_duck():
+    """Return the process-wide DuckDB connection, created once and reused across reruns."""
+    con = duckdb.connect()
+    con.execute(f"PRAGMA threads={DUCKDB_THREADS}")
+    # Read here, not at import, so a value from .env (loaded by _init_env) is seen
+    memory_limit = os.getenv("DUCKDB_MEMORY_LIMIT")
+    if memory_limit:
+        con.execute("SET memory_limit = ?", [memory_limit])
+    con.execute("PRAGMA enable_object_cache=true")
+    con.execute("PRAGMA enable_progress_bar=false")
+    return con
+
+
+def _session_duck():
+    """Return this session's DuckDB cursor.
+
+    Cursors share the database (settings, caches) of `get_duck()` but keep their
+    own registered views, so concurrent sessions don't clobber each other's `data_df`.
+    """
+    if st.session_state.get("duck") is None:
+        st.session_state.duck = get_duck().cursor()
+    return st.session_state.duck
+
+
+@st.cache_data(show_spinner=False, max_entries=16, ttl=3600)
+def run_sql(sql: str, data_fingerprint: str) -> pd.DataFrame:
+    """Execute `sql` against the registered `data_df`.
+
+    `data_fingerprint` identifies the uploaded file contents, so repeating a
+    query on the same data is a cache hit and switching files invalidates it.
+    Bounded in count and age since each entry holds a full copy of its result.
+    """
+    return _session_duck().sql(sql).fetchdf()
+
+
+def _dtype_label(dtype) -> str:
+    """Name a column dtype for the prompt and column info, hiding categoricals.
+
+    Categoricals are only a storage detail of `_shrink_dtypes`, which converts
+    all-string columns alone; DuckDB reads them as VARCHAR, so they are
+    labelled "string" like the uncategorized string columns.
+    """
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "string"
+    return str(dtype)
+
+
+@st.cache_data(show_spinner=False)
+def _prompt_context(data_fingerprint: str, _df: pd.DataFrame) -> tuple[str, str]:
+    """Return the (sample CSV, "col:dtype, ..." schema) strings for the LLM prompt.
+
+    Built once per dataset (keyed on `data_fingerprint`; `_df` is not hashed)
+    rather than re-serializing rows on every Run click. The sample is capped at
+    PROMPT_SAMPLE_COLS x PROMPT_SAMPLE_ROWS since prompt size drives LLM latency and cost.
+    """
+    sample_csv = _df.iloc[:PROMPT_SAMPLE_ROWS, :PROMPT_SAMPLE_COLS].to_csv(index=False)
+    if len(_df.columns) > PROMPT_SAMPLE_COLS:
+        sample_csv += f"(showing {PROMPT_SAMPLE_COLS} of {len(_df.columns)} columns)\n"
+    schema_str = ", ".join(f"{col}:{_dtype_label(dtype)}" for col, dtype in _df.dtypes.items())
+    return sample_csv, schema_str
+
+
+@st.cache_data(show_spinner=False)
+def _column_info(data_fingerprint: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """Per-column dtype and null counts, computed in a single pass once per dataset"""
+    non_null = _df.notna().sum()
+    return pd.DataFrame({
+        "Column Name": _df.columns,
+        "Data Type": _df.dtypes.map(_dtype_label),
+        "Non-Null Count": non_null,
+        "Null Count": len(_df) - non_null
+    })
+
+
+def _results_csv(res: pd.DataFrame) -> bytes:
+    """Serialize query results to CSV with pyarrow's multi-threaded writer"""
+    try:
+        buf = io.BytesIO()
+        pa_csv.write_csv(pa.Table.from_pandas(res, preserve_index=False), buf)
+        return buf.getvalue()
+    except Exception:
+        # Column types the Arrow CSV writer can't handle (e.g. nested lists)
+        return res.to_csv(index=False).encode()
 
 
 # Initialize session state
-if "df" not in st.session_state:
-    st.session_state.df = None
+if "data_fingerprint" not in st.session_state:
+    st.session_state.data_fingerprint = None
 if "file_name" not in st.session_state:
     st.session_state.file_name = None
 if "show_data_sample" not in st.session_state:
     st.session_state.show_data_sample = False
 
+# --- Left sidebar: DuckDB knobs for power users ---
+with st.sidebar:
+    with st.expander("DuckDB Settings"):
+        st.caption("Settings apply to the shared database, i.e. every session.")
+        threads_input = st.number_input("Threads", min_value=1, value=DUCKDB_THREADS, step=1)
+        memory_input = st.text_input(
+            "Memory limit",
+            value=os.getenv("DUCKDB_MEMORY_LIMIT") or "",
+            placeholder="DuckDB default (80% of RAM)",
+            help="E.g. 4GB or 512MB; leave empty for DuckDB's default",
+        )
+        if st.button("Apply DuckDB settings"):
+            # Through this session's cursor (connections aren't thread-safe);
+            # both settings are database-wide, so they still reach every session
+            con = _session_duck()
+            try:
+                con.execute("SET threads = ?", [int(threads_input)])
+                if memory_input:
+                    con.execute("SET memory_limit = ?", [memory_input])
+                else:
+                    con.execute("RESET memory_limit")
+                st.success("Applied DuckDB settings")
+            except duckdb.Error as e:
+                st.error(f"Failed to apply DuckDB settings: {e}")
+
 st.set_page_config(page_title="AI Data Analyst", layout="wide")
 st.title("AI Data Analyst (Groq)")
 
 # File upload section
 st.subheader("Upload Dataset")
 uploaded = st.file_uploader("Upload CSV or Excel file", type=["csv", "xlsx", "xls"])
+df = duck_data = None
 
 if uploaded:
-    # Store file info
-    st.session_state.file_name = uploaded.name
-    
-    # Read file based on type
-    if uploaded.name.endswith('.csv'):
-        st.session_state.df = pd.read_csv(uploaded)
-    else:
-        st.session_state.df = pd.read_excel(uploaded)
+    # Parse and derive everything only when a different file arrives; every widget
+    # interaction reruns this block while the file sits in the uploader
+    key = (uploaded.name, uploaded.size, uploaded.file_id)
+    is_new_file = st.session_state.get("loaded_key") != key
+    if is_new_file:
+        # Drop the view over the previous file so its Arrow buffers can be freed
+        if st.session_state.get("loaded_key") is not None:
+            _session_duck().unregister("data_df")
+
+        # Store file info
+        st.session_state.file_name = uploaded.name
+        st.session_state.data_fingerprint = hashlib.blake2b(uploaded.getvalue(), digest_size=16).hexdigest()
+
+    # Data lives in a cross-session cache; session_state only holds its fingerprint
+    df, duck_data = _shared_dataset(st.session_state.data_fingerprint, uploaded.name, uploaded)
+
+    if is_new_file:
+        st.session_state.top10 = df.head(10).copy()
+        st.session_state.sample_csv, st.session_state.schema_str = _prompt_context(
+            st.session_state.data_fingerprint, df
+        )
+        st.session_state.loaded_key = key
     
     st.success(f"✓ File loaded: {uploaded.name}")
     
     # Display data sample button
-    if st.session_state.df is not None:
+    if df is not None:
         def toggle_sample():
             st.session_state.show_data_sample = not st.session_state.show_data_sample
         
@@ -130,29 +457,77 @@ if uploaded:
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                st.metric("Total Rows", st.session_state.df.shape[0])
+                st.metric("Total Rows", df.shape[0])
             with col2:
-                st.metric("Total Columns", st.session_state.df.shape[1])
+                st.metric("Total Columns", df.shape[1])
             with col3:
                 st.metric("File Name", st.session_state.file_name)
             
             # Column info
             st.subheader("Column Information")
-            col_info = pd.DataFrame({
-                "Column Name": st.session_state.df.columns,
-                "Data Type": st.session_state.df.dtypes.astype(str),
-                "Non-Null Count": st.session_state.df.count(),
-                "Null Count": st.session_state.df.isnull().sum()
-            })
+            col_info = _column_info(st.session_state.data_fingerprint, df)
             st.dataframe(col_info, use_container_width=True)
             
             # Top 10 rows
             st.subheader("Top 10 Rows")
-            st.dataframe(st.session_state.df.head(10), use_container_width=True)
+            st.dataframe(st.session_state.top10, use_container_width=True)
             st.divider()
 
+
+def show_reply(reply, sql_only, key=""):
+    """Extract SQL from a model reply, display it and (unless `sql_only`) run it.
+
+    `key` disambiguates widgets when several replies are shown on one page.
+    """
+    # Display SQL
+    st.subheader("Generated SQL Query")
+
+    # Extract SQL
+    m = _SQL_RE.search(reply)
+    if m:
+        sql = m.group(1).strip()
+    elif reply.lstrip().upper().startswith("SELECT"):
+        sql = reply.strip()
+    else:
+        sql = None
+
+    if reply.strip().startswith("EXPLANATION:"):
+        st.info(reply)
+    elif sql:
+        st.code(sql, language="sql")
+
+        if not sql_only:
+            # Execute SQL
+            try:
+                with st.spinner("Executing query..."):
+                    res = run_sql(sql, st.session_state.data_fingerprint)
+                st.subheader("Query Results")
+                if len(res) > MAX_DISPLAY:
+                    st.caption(f"Showing first {MAX_DISPLAY:,} of {len(res):,} rows — download CSV for full result")
+                    st.dataframe(res.head(MAX_DISPLAY), use_container_width=True)
+                else:
+                    st.dataframe(res, use_container_width=True)
+
+                # Download option; the CSV is only built when the button is clicked
+                st.download_button(
+                    label="📥 Download Results as CSV",
+                    data=lambda: _results_csv(res),
+                    file_name="query_results.csv",
+                    mime="text/csv",
+                    key=f"download_{key}"
+                )
+            except Exception as e:
+                st.error(f"❌ SQL Execution Error: {str(e)}")
+                st.info("**Raw Response from AI:**")
+                st.code(reply)
+    else:
+        st.warning("Could not extract SQL from response")
+        st.info("**AI Response:**")
+        st.code(reply)
+
+
 # Question section - only show if data is loaded
-if st.session_state.df is not None:
+if df is not None:
     st.subheader("Ask Questions About Your Data")
     
     query = st.text_input(
@@ -163,12 +538,12 @@ if st.session_state.df is not None:
     col1, col2 = st.columns([3, 1])
     with col1:
         sql_only = st.checkbox("Get SQL Query Only", value=False)
+        compare = st.checkbox("Compare models", value=False, help="Ask several models in parallel and show their answers side by side")
     with col2:
         run = st.button("▶ Run Analysis", type="primary")
     
     if query and run:
-        df = st.session_state.df
-        duckdb.register("data_df", df)
+        _session_duck().register("data_df", duck_data)
         
         # Prompt for SQL generation
         system = (
@@ -181,67 +556,29 @@ if st.session_state.df is not None:
             "5) Optimize for clarity and correctness\n"
         )
         
-        # Include schema info
-        sample = df.head(10).to_csv(index=False)
+        # Include schema info (precomputed at upload)
         user_msg = (
             f"Dataset Info:\n"
-            f"Columns: {', '.join(df.columns.tolist())}\n"
-            f"Data Types: {', '.join([f'{col}({dtype})' for col, dtype in zip(df.columns, df.dtypes)])}\n\n"
-            f"Sample Data:\n{sample}\n\n"
+            f"Columns (name:type): {st.session_state.schema_str}\n\n"
+            f"Sample Data:\n{st.session_state.sample_csv}\n\n"
             f"User Question: {query}\n\n"
             f"Generate a SQL query or provide an explanation. Return in ```sql``` fences or start with EXPLANATION:"
         )
         
         try:
-            with st.spinner("Generating SQL query..."):
-                reply = call_groq_model(system, user_msg)
-            
-            # Display SQL
-            st.subheader("Generated SQL Query")
-            
-            # Extract SQL
-            sql = None
-            if "```sql" in reply:
-                start = reply.find("```sql") + len("```sql")
-                end = reply.find("```", start)
-                sql = reply[start:end].strip() if end != -1 else reply[start:].strip()
-            elif "```SQL" in reply:
-                start = reply.find("```SQL") + len("```SQL")
-                end = reply.find("```", start)
-                sql = reply[start:end].strip() if end != -1 else reply[start:].strip()
-            elif reply.strip().startswith("SELECT"):
-                sql = reply.strip()
-            
-            if reply.strip().startswith("EXPLANATION:"):
-                st.info(reply)
-            elif sql:
-                st.code(sql, language="sql")
-                
-                if not sql_only:
-                    # Execute SQL
-                    try:
-                        with st.spinner("Executing query..."):
-                            res = duckdb.sql(sql).fetchdf()
-                        st.subheader("Query Results")
-                        st.dataframe(res, use_container_width=True)
-                        
-                        # Download option
-                        csv_data = res.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download Results as CSV",
-                            data=csv_data,
-                            file_name="query_results.csv",
-                            mime="text/csv"
-                        )
-                    except Exception as e:
-                        st.error(f"❌ SQL Execution Error: {str(e)}")
-                        st.info("**Raw Response from AI:**")
-                        st.code(reply)
+            if compare:
+                with st.spinner("Generating SQL queries..."):
+                    replies = call_groq_models(system, user_msg)
+                for tab, model, reply in zip(st.tabs(list(COMPARE_MODELS)), COMPARE_MODELS, replies):
+                    with tab:
+                        if isinstance(reply, Exception):
+                            st.error(f"❌ Error: {str(reply)}")
+                        else:
+                            show_reply(reply, sql_only, key=model)
             else:
-                st.warning("Could not extract SQL from response")
-                st.info("**AI Response:**")
-                st.code(reply)
-        
+                reply = call_groq_model(system, user_msg)
+                show_reply(reply, sql_only)
+
         except Exception as e:
             st.error(f"❌ Error: {str(e)}")
             st.info("Make sure your GROQ_API_KEY is valid and the model is available.")